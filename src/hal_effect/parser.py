@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import mmap
+import os
 import struct
-from typing import Optional
+from array import array
+from collections.abc import Buffer, Iterator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
+from functools import cache
+from itertools import repeat
+from operator import itemgetter
+from typing import Callable, List, Optional, Tuple, Union
 
 from .types import (
     ColorBlendInstruction,
@@ -28,31 +36,89 @@ from .types import (
     WaitInstruction,
 )
 
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_S32 = struct.Struct(">i")
+_F32 = struct.Struct(">f")
+_VEC3F = struct.Struct(">fff")
+_U16_PAIR = struct.Struct(">HH")
+_F32_PAIR = struct.Struct(">ff")
+
+# Fixed 48-byte effect script header; the three unknown floats are skipped
+_HEADER = struct.Struct(">HHHHIfffff12xf")
+
+
+def _component_layout(
+    mask: int, count: int, code: str
+) -> Tuple[struct.Struct, itemgetter]:
+    """Build the struct and argument getter for a component mask.
+
+    The getter maps the unpacked values (followed by a trailing None) to one
+    positional argument per component, using None for absent components.
+    """
+    present = [bit for bit in range(count) if mask >> bit & 1]
+    layout = struct.Struct(">" + code * len(present))
+    getter = itemgetter(
+        *(
+            present.index(bit) if bit in present else len(present)
+            for bit in range(count)
+        )
+    )
+    return layout, getter
+
+
+def _build_opcodes() -> List[Optional[OpCode]]:
+    """Map every opcode byte to its OpCode, folding component masks into the base."""
+    opcodes: List[Optional[OpCode]] = [None] * 256
+    for op in OpCode:
+        opcodes[op] = op
+    for opcode in range(0x80):
+        opcodes[opcode] = OpCode.WAIT
+    for base in (OpCode.SET_POS, OpCode.ADD_POS, OpCode.SET_VEL, OpCode.ADD_VEL):
+        for mask in range(8):
+            opcodes[base | mask] = base
+    for base in (OpCode.SET_PRIM_BLEND, OpCode.SET_ENV_BLEND):
+        for mask in range(16):
+            opcodes[base | mask] = base
+    return opcodes
+
+
+# Looking members up here avoids constructing an OpCode for every instruction
+_OPCODES = _build_opcodes()
+
+# Vector and color blend opcodes use their low bits as a component mask; the
+# layout of the present components is precomputed for every mask value.
+_VECTOR_LAYOUTS = [_component_layout(mask, 3, "f") for mask in range(8)]
+_COLOR_LAYOUTS = [_component_layout(mask, 4, "B") for mask in range(16)]
+
 
 class BinaryReader:
     """Helper class for reading binary data with a position cursor."""
 
-    def __init__(self, data: bytes):
-        self.data = data
+    def __init__(self, data: Buffer):
+        # A read-only byte view lets unpack_from and indexing work without copying;
+        # casting makes indexing and len() count bytes for any buffer format
+        self.data = memoryview(data).cast("B").toreadonly()
+        self.size = len(self.data)
         self.offset = 0
 
     def read_float(self) -> float:
-        value = struct.unpack(">f", self.data[self.offset : self.offset + 4])[0]
+        value = _F32.unpack_from(self.data, self.offset)[0]
         self.offset += 4
         return value
 
     def read_u16(self) -> int:
-        value = struct.unpack(">H", self.data[self.offset : self.offset + 2])[0]
+        value = _U16.unpack_from(self.data, self.offset)[0]
         self.offset += 2
         return value
 
     def read_u32(self) -> int:
-        value = struct.unpack(">I", self.data[self.offset : self.offset + 4])[0]
+        value = _U32.unpack_from(self.data, self.offset)[0]
         self.offset += 4
         return value
 
     def read_s32(self) -> int:
-        value = struct.unpack(">i", self.data[self.offset : self.offset + 4])[0]
+        value = _S32.unpack_from(self.data, self.offset)[0]
         self.offset += 4
         return value
 
@@ -62,19 +128,18 @@ class BinaryReader:
         return value
 
     def read_vec3f(self) -> Vec3f:
-        x = self.read_float()
-        y = self.read_float()
-        z = self.read_float()
+        x, y, z = _VEC3F.unpack_from(self.data, self.offset)
+        self.offset += 12
         return Vec3f(x, y, z)
 
     def read_var_length_u16(self) -> int:
-        if self.offset >= len(self.data):
+        if self.offset >= self.size:
             return 0
 
         first_byte = self.read_u8()
 
         if first_byte & 0x80:
-            if self.offset >= len(self.data):
+            if self.offset >= self.size:
                 return 0
             value = ((first_byte & 0x7F) << 8) + self.read_u8()
         else:
@@ -92,7 +157,444 @@ class BinaryReader:
 
     def can_read(self, size: int) -> bool:
         """Check if we can read size bytes from current position."""
-        return self.offset + size <= len(self.data)
+        return self.offset + size <= self.size
+
+
+def _read_var_length_u16(data: bytes, offset: int) -> Tuple[int, int]:
+    """Decode a variable length value, returning it with the offset past it."""
+    if offset >= len(data):
+        return 0, offset
+
+    first_byte = data[offset]
+    offset += 1
+
+    if first_byte & 0x80:
+        if offset >= len(data):
+            return 0, offset
+        value = ((first_byte & 0x7F) << 8) + data[offset]
+        offset += 1
+    else:
+        value = first_byte
+
+    return value + 1, offset
+
+
+# Instruction handlers, indexed by opcode through _HANDLERS. Each handler decodes
+# the instruction whose opcode byte is at offset, reading from data directly.
+_Handler = Callable[[bytes, int], Instruction]
+
+
+def _parse_wait(data: bytes, offset: int) -> Instruction:
+    opcode = data[offset]
+    offset += 1
+    frames = opcode & 0x1F
+    if opcode & 0x20:
+        frames = (frames << 8) | data[offset]
+        offset += 1
+    data_id = None
+    if opcode & 0x40:
+        data_id = data[offset]
+    return Instruction(OpCode.WAIT, WaitInstruction(frames, data_id))
+
+
+def _parse_vector(data: bytes, offset: int) -> Instruction:
+    opcode = data[offset]
+    layout, getter = _VECTOR_LAYOUTS[opcode & 7]
+    values = layout.unpack_from(data, offset + 1)
+    args = VectorInstruction(*getter(values + (None,)))
+    return Instruction(_OPCODES[opcode], args)
+
+
+def _parse_color_blend(data: bytes, offset: int) -> Instruction:
+    opcode = data[offset]
+    steps, offset = _read_var_length_u16(data, offset + 1)
+    layout, getter = _COLOR_LAYOUTS[opcode & 0xF]
+    values = layout.unpack_from(data, offset)
+    args = ColorBlendInstruction(steps, *getter(values + (None,)))
+    return Instruction(_OPCODES[opcode], args)
+
+
+def _parse_script(data: bytes, offset: int) -> Instruction:
+    (script_id,) = _U16.unpack_from(data, offset + 1)
+    return Instruction(_OPCODES[data[offset]], ScriptInstruction(script_id))
+
+
+def _parse_size_lerp(data: bytes, offset: int) -> Instruction:
+    steps, offset = _read_var_length_u16(data, offset + 1)
+    (size,) = _F32.unpack_from(data, offset)
+    return Instruction(OpCode.SET_SIZE_LERP, SizeLerpInstruction(steps, size))
+
+
+def _parse_life_rand(data: bytes, offset: int) -> Instruction:
+    base, range_val = _U16_PAIR.unpack_from(data, offset + 1)
+    return Instruction(OpCode.SET_LIFE_RAND, LifeRandInstruction(base, range_val))
+
+
+def _parse_try_dead_rand(data: bytes, offset: int) -> Instruction:
+    return _try_dead_rand_instruction(data[offset + 1])
+
+
+def _parse_vel_rand(data: bytes, offset: int) -> Instruction:
+    x, y, z = _VEC3F.unpack_from(data, offset + 1)
+    return Instruction(OpCode.ADD_VEL_RAND, VelRandInstruction(x, y, z))
+
+
+def _parse_vel_angle(data: bytes, offset: int) -> Instruction:
+    (angle,) = _F32.unpack_from(data, offset + 1)
+    return Instruction(OpCode.SET_VEL_ANGLE, VelAngleInstruction(angle))
+
+
+def _parse_vel_mul(data: bytes, offset: int) -> Instruction:
+    (factor,) = _F32.unpack_from(data, offset + 1)
+    return Instruction(OpCode.MUL_VEL, VelMulInstruction(factor))
+
+
+def _parse_vel_axis_mul(data: bytes, offset: int) -> Instruction:
+    x, y, z = _VEC3F.unpack_from(data, offset + 1)
+    return Instruction(OpCode.MUL_VEL_AXIS, VelAxisMulInstruction(x, y, z))
+
+
+def _parse_unk(data: bytes, offset: int) -> Instruction:
+    base = data[offset + 1]
+    range_val = data[offset + 2]
+    return Instruction(OpCode.SET_UNK_0B, UnkInstruction(base, range_val))
+
+
+def _parse_set_flags(data: bytes, offset: int) -> Instruction:
+    return _set_flags_instruction(data[offset + 1])
+
+
+def _parse_set_loop(data: bytes, offset: int) -> Instruction:
+    return _set_loop_instruction(data[offset + 1])
+
+
+def _parse_size_rand(data: bytes, offset: int) -> Instruction:
+    steps, offset = _read_var_length_u16(data, offset + 1)
+    base, range_val = _F32_PAIR.unpack_from(data, offset)
+    return Instruction(
+        OpCode.SET_SIZE_RAND, SetSizeRandInstruction(steps, base, range_val)
+    )
+
+
+def _parse_simple(data: bytes, offset: int) -> Instruction:
+    return _simple_instruction(data[offset])
+
+
+# Instructions without arguments or with a single byte argument can only take a
+# few hundred distinct values. They are frozen, so equal instances are shared
+# instead of being built for every occurrence.
+@cache
+def _simple_instruction(opcode: int) -> Instruction:
+    return Instruction(_OPCODES[opcode], SimpleInstruction())
+
+
+@cache
+def _try_dead_rand_instruction(probability: int) -> Instruction:
+    return Instruction(OpCode.TRY_DEAD_RAND, TryDeadRandInstruction(probability))
+
+
+@cache
+def _set_flags_instruction(flags: int) -> Instruction:
+    return Instruction(OpCode.SET_FLAGS, SetFlagsInstruction(flags))
+
+
+@cache
+def _set_loop_instruction(count: int) -> Instruction:
+    return Instruction(OpCode.SET_LOOP, SetLoopInstruction(count))
+
+
+def _build_handlers() -> List[Optional[_Handler]]:
+    handlers: List[Optional[_Handler]] = [None] * 256
+
+    # Wait command (0x00-0x7F)
+    for opcode in range(0x80):
+        handlers[opcode] = _parse_wait
+
+    # Vector operations, low 3 bits select the components
+    for base in (OpCode.SET_POS, OpCode.ADD_POS, OpCode.SET_VEL, OpCode.ADD_VEL):
+        for mask in range(8):
+            handlers[base | mask] = _parse_vector
+
+    # Color blend operations, low 4 bits select the components
+    for base in (OpCode.SET_PRIM_BLEND, OpCode.SET_ENV_BLEND):
+        for mask in range(16):
+            handlers[base | mask] = _parse_color_blend
+
+    handlers[OpCode.MAKE_SCRIPT] = _parse_script
+    handlers[OpCode.MAKE_GENERATOR] = _parse_script
+    handlers[OpCode.MAKE_ID] = _parse_script
+    handlers[OpCode.SET_SIZE_LERP] = _parse_size_lerp
+    handlers[OpCode.SET_LIFE_RAND] = _parse_life_rand
+    handlers[OpCode.TRY_DEAD_RAND] = _parse_try_dead_rand
+    handlers[OpCode.ADD_VEL_RAND] = _parse_vel_rand
+    handlers[OpCode.SET_VEL_ANGLE] = _parse_vel_angle
+    handlers[OpCode.MUL_VEL] = _parse_vel_mul
+    handlers[OpCode.MUL_VEL_AXIS] = _parse_vel_axis_mul
+    handlers[OpCode.SET_UNK_0B] = _parse_unk
+    handlers[OpCode.SET_FLAGS] = _parse_set_flags
+    handlers[OpCode.SET_LOOP] = _parse_set_loop
+    handlers[OpCode.SET_SIZE_RAND] = _parse_size_rand
+
+    # Simple instructions with no parameters
+    for opcode in (
+        OpCode.LOOP,
+        OpCode.SET_RETURN,
+        OpCode.RETURN,
+        OpCode.DEAD,
+        OpCode.END,
+    ):
+        handlers[opcode] = _parse_simple
+
+    return handlers
+
+
+_HANDLERS = _build_handlers()
+
+
+# Instruction sizes, including the opcode byte. _SIZES holds the size of every
+# opcode whose size follows from the opcode byte alone, and 0 otherwise. Opcodes
+# with a variable length argument have a sizer in _SIZERS instead, which returns
+# the size of the instruction starting at offset.
+_Sizer = Callable[[bytes, int], int]
+
+
+def _var_length_size(data: bytes, offset: int) -> int:
+    if offset < len(data) and data[offset] & 0x80:
+        return 2
+    return 1
+
+
+def _size_color_blend(data: bytes, offset: int) -> int:
+    return 1 + _var_length_size(data, offset + 1) + (data[offset] & 0xF).bit_count()
+
+
+def _size_var_length(size: int) -> _Sizer:
+    return lambda data, offset: size + _var_length_size(data, offset + 1)
+
+
+def _build_sizes() -> Tuple[bytearray, List[Optional[_Sizer]]]:
+    sizes = bytearray(256)
+    sizers: List[Optional[_Sizer]] = [None] * 256
+
+    # Wait command, with optional extra frames and data ID bytes
+    for opcode in range(0x80):
+        sizes[opcode] = 1 + (opcode >> 5 & 1) + (opcode >> 6 & 1)
+
+    for base in (OpCode.SET_POS, OpCode.ADD_POS, OpCode.SET_VEL, OpCode.ADD_VEL):
+        for mask in range(8):
+            sizes[base | mask] = 1 + 4 * mask.bit_count()
+
+    for base in (OpCode.SET_PRIM_BLEND, OpCode.SET_ENV_BLEND):
+        for mask in range(16):
+            sizers[base | mask] = _size_color_blend
+
+    sizes[OpCode.MAKE_SCRIPT] = 3
+    sizes[OpCode.MAKE_GENERATOR] = 3
+    sizes[OpCode.MAKE_ID] = 3
+    sizers[OpCode.SET_SIZE_LERP] = _size_var_length(5)
+    sizes[OpCode.SET_LIFE_RAND] = 5
+    sizes[OpCode.TRY_DEAD_RAND] = 2
+    sizes[OpCode.ADD_VEL_RAND] = 13
+    sizes[OpCode.SET_VEL_ANGLE] = 5
+    sizes[OpCode.MUL_VEL] = 5
+    sizes[OpCode.MUL_VEL_AXIS] = 13
+    sizes[OpCode.SET_UNK_0B] = 3
+    sizes[OpCode.SET_FLAGS] = 2
+    sizes[OpCode.SET_LOOP] = 2
+    sizers[OpCode.SET_SIZE_RAND] = _size_var_length(9)
+
+    for opcode in (
+        OpCode.LOOP,
+        OpCode.SET_RETURN,
+        OpCode.RETURN,
+        OpCode.DEAD,
+        OpCode.END,
+    ):
+        sizes[opcode] = 1
+
+    return sizes, sizers
+
+
+_SIZES, _SIZERS = _build_sizes()
+
+
+def _max_instruction_size() -> int:
+    """Return the size of the longest instruction in the size tables."""
+    # A set top bit in the byte after the opcode selects the two-byte form of a
+    # variable length argument, so that is each sizer's longest encoding
+    variable = (
+        sizer(bytes([opcode, 0x80]), 0)
+        for opcode, sizer in enumerate(_SIZERS)
+        if sizer is not None
+    )
+    return max(max(_SIZES), *variable)
+
+
+_MAX_INSTRUCTION_SIZE = _max_instruction_size()
+
+
+class Bytecode(Sequence[Instruction]):
+    """Effect script bytecode that is decoded on access.
+
+    The raw instruction bytes are kept together with the opcode and start offset
+    of every instruction, so Instruction objects are only built when indexed or
+    iterated. Code that only needs the opcodes can scan ``opcodes`` directly.
+    """
+
+    __slots__ = ("data", "offsets", "opcodes")
+
+    def __init__(self, data: bytes, opcodes: bytes, offsets: array):
+        self.data = data
+        self.opcodes = opcodes
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Instruction, Bytecode]:
+        if isinstance(index, slice):
+            return self._slice(range(*index.indices(len(self))))
+        return _HANDLERS[self.opcodes[index]](self.data, self.offsets[index])
+
+    def __iter__(self) -> Iterator[Instruction]:
+        handlers = _HANDLERS
+        data = self.data
+        for opcode, offset in zip(self.opcodes, self.offsets):
+            yield handlers[opcode](data, offset)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Bytecode):
+            return self.data == other.data
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Bytecode({list(self)!r})"
+
+    def _slice(self, indices: range) -> Bytecode:
+        """Copy the selected instructions into a new, still undecoded, Bytecode."""
+        data = self.data
+        offsets = self.offsets
+        count = len(offsets)
+
+        pieces = []
+        new_offsets = array("I")
+        position = 0
+        for index in indices:
+            start = offsets[index]
+            end = offsets[index + 1] if index + 1 < count else len(data)
+            pieces.append(data[start:end])
+            new_offsets.append(position)
+            position += end - start
+
+        opcodes = bytes(self.opcodes[index] for index in indices)
+        return Bytecode(b"".join(pieces), opcodes, new_offsets)
+
+
+def _parse_bytecode(reader: BinaryReader, next_ptr: Optional[int] = None) -> Bytecode:
+    """Scan instructions until END, an unknown opcode or the next effect.
+
+    Only instruction boundaries are determined here; decoding is deferred to
+    Bytecode. An instruction that runs past the end of the data raises
+    struct.error, like decoding it would.
+    """
+    data = reader.data
+    size = reader.size
+    limit = size if next_ptr is None else min(next_ptr, size)
+    sizes = _SIZES
+    sizers = _SIZERS
+    end_opcode = int(OpCode.END)
+
+    # Plain lists grow faster than bytearray/array; convert once at the end
+    start = offset = reader.offset
+    opcodes: List[int] = []
+    offsets: List[int] = []
+    while offset < limit:
+        opcode = data[offset]
+        length = sizes[opcode]
+        if not length:
+            sizer = sizers[opcode]
+            if sizer is None:
+                break
+            length = sizer(data, offset)
+
+        next_offset = offset + length
+        if next_offset > size:
+            raise struct.error(
+                f"instruction at offset {offset:#x} runs past the end of the data"
+            )
+
+        opcodes.append(opcode)
+        offsets.append(offset - start)
+        offset = next_offset
+        if opcode == end_opcode:
+            break
+
+    reader.offset = offset
+    return Bytecode(bytes(data[start:offset]), bytes(opcodes), array("I", offsets))
+
+
+def _parse_effect_script(
+    data: Buffer, ptr: int, next_ptr: Optional[int] = None
+) -> EffectScript:
+    """Parse the effect script at ptr.
+
+    Uses its own reader, so scripts can be parsed independently of each other.
+    """
+    reader = BinaryReader(data)
+    try:
+        reader.seek(ptr)
+        (
+            kind,
+            texture_id,
+            effect_lifetime,
+            particle_lifetime,
+            flags,
+            gravity,
+            friction,
+            vel_x,
+            vel_y,
+            vel_z,
+            size,
+        ) = _HEADER.unpack_from(reader.data, reader.offset)
+        reader.offset += _HEADER.size
+
+        bytecode = _parse_bytecode(reader, next_ptr)
+    finally:
+        # Release the view even on errors, so the data can be resized or closed
+        reader.data.release()
+
+    return EffectScript(
+        kind=kind,
+        texture_id=texture_id,
+        effect_lifetime=effect_lifetime,
+        particle_lifetime=particle_lifetime,
+        flags=flags,
+        gravity=gravity,
+        friction=friction,
+        velocity=Vec3f(vel_x, vel_y, vel_z),
+        size=size,
+        bytecode=bytecode,
+    )
+
+
+def _script_bytes(
+    data: memoryview, ptr: int, next_ptr: Optional[int]
+) -> Tuple[bytes, Optional[int]]:
+    """Copy out everything the effect script at ptr can read, rebased to offset 0.
+
+    Returns the bytes and the rebased next_ptr. The last instruction may run past
+    next_ptr, so a little extra is copied to parse it exactly like in place.
+    """
+    if next_ptr is None:
+        return bytes(data[ptr:]), None
+    end = max(next_ptr, ptr + _HEADER.size) + _MAX_INSTRUCTION_SIZE
+    return bytes(data[ptr:end]), next_ptr - ptr
+
+
+# Below this many scripts, handing work to an executor costs more than it saves
+_PARALLEL_THRESHOLD = 8
 
 
 class EffectScriptParser:
@@ -101,204 +603,124 @@ class EffectScriptParser:
     def __init__(self):
         self.reader = None
 
-    def parse(self, data: bytes) -> ParticleScriptDesc:
-        """Parse a particle script description from binary data."""
+    def parse(
+        self, data: Buffer, executor: Optional[Executor] = None
+    ) -> ParticleScriptDesc:
+        """Parse a particle script description from binary data.
+
+        Args:
+            data: The particle script data, as bytes or any other buffer. The
+                data is read in place; only each script's bytecode is copied.
+            executor: Optional executor to parse the effect scripts concurrently.
+                Scripts are independent of each other, so any executor works. A
+                thread pool shares data with its workers; other executors are
+                sent a copy of just each job's own script.
+        """
         self.reader = BinaryReader(data)
-        return self._parse_particle_script_desc()
+        try:
+            return self._parse_particle_script_desc(data, executor)
+        finally:
+            # Don't keep the caller's buffer exported (and so locked) after parsing
+            self.reader.data.release()
+            self.reader = None
+
+    def parse_file(
+        self, path: Union[str, os.PathLike], executor: Optional[Executor] = None
+    ) -> ParticleScriptDesc:
+        """Parse a particle script description from a file.
+
+        The file is memory-mapped and parsed in place instead of being read into
+        memory first. The result holds no references to the mapping.
+
+        Args:
+            path: The particle script file.
+            executor: Optional executor to parse the effect scripts concurrently,
+                as for parse().
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # An empty file can't be mapped; fail the same way parse() does
+                return self.parse(b"", executor)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                return self.parse(mapping, executor)
 
     def _parse_instruction(self, data: Optional[bytes] = None) -> Optional[Instruction]:
         """Parse a single instruction from the current position or from provided bytes data.
 
         Args:
-            data: Optional bytes to parse. If provided, creates a new reader for just this instruction.
+            data: Optional bytes to parse. If provided, the instruction at the start of
+                data is decoded directly, without touching the parser's reader.
         """
-        reader = BinaryReader(data) if data is not None else self.reader
+        if data is not None:
+            if not data:
+                return None
+            handler = _HANDLERS[data[0]]
+            return handler(data, 0) if handler is not None else None
 
+        reader = self.reader
         if not reader.can_read(1):
             return None
 
-        opcode = reader.read_u8()
-
-        # Wait command (0x00-0x7F)
-        if opcode < 0x80:
-            frames = opcode & 0x1F
-            if opcode & 0x20:
-                extra = reader.read_u8()
-                frames = (frames << 8) | extra
-            data_id = None
-            if opcode & 0x40:
-                data_id = reader.read_u8()
-            return Instruction(OpCode.END, WaitInstruction(frames, data_id))
-
-        # Vector operations
-        if opcode & 0xF8 in [
-            OpCode.SET_POS,
-            OpCode.ADD_POS,
-            OpCode.SET_VEL,
-            OpCode.ADD_VEL,
-        ]:
-            args = VectorInstruction()
-            if opcode & 1:
-                args.x = reader.read_float()
-            if opcode & 2:
-                args.y = reader.read_float()
-            if opcode & 4:
-                args.z = reader.read_float()
-            return Instruction(OpCode(opcode & 0xF8), args)
-
-        # Color blend operations
-        if opcode & 0xF0 in [OpCode.SET_PRIM_BLEND, OpCode.SET_ENV_BLEND]:
-            steps = reader.read_var_length_u16()
-            args = ColorBlendInstruction(steps)
-            if opcode & 1:
-                args.red = reader.read_u8()
-            if opcode & 2:
-                args.green = reader.read_u8()
-            if opcode & 4:
-                args.blue = reader.read_u8()
-            if opcode & 8:
-                args.alpha = reader.read_u8()
-            return Instruction(OpCode(opcode & 0xF0), args)
-
-        # Other instructions based on exact opcode
-        try:
-            op = OpCode(opcode)
-        except ValueError:
+        offset = reader.offset
+        opcode = reader.data[offset]
+        handler = _HANDLERS[opcode]
+        if handler is None:
+            reader.offset += 1
             return None
 
-        if op in [OpCode.MAKE_SCRIPT, OpCode.MAKE_GENERATOR, OpCode.MAKE_ID]:
-            script_id = reader.read_u16()
-            return Instruction(op, ScriptInstruction(script_id))
-
-        elif op == OpCode.SET_SIZE_LERP:
-            steps = reader.read_var_length_u16()
-            size = reader.read_float()
-            return Instruction(op, SizeLerpInstruction(steps, size))
-
-        elif op == OpCode.SET_LIFE_RAND:
-            base = reader.read_u16()
-            range_val = reader.read_u16()
-            return Instruction(op, LifeRandInstruction(base, range_val))
-
-        elif op == OpCode.TRY_DEAD_RAND:
-            prob = reader.read_u8()
-            return Instruction(op, TryDeadRandInstruction(prob))
-
-        elif op == OpCode.ADD_VEL_RAND:
-            x = reader.read_float()
-            y = reader.read_float()
-            z = reader.read_float()
-            return Instruction(op, VelRandInstruction(x, y, z))
-
-        elif op == OpCode.SET_VEL_ANGLE:
-            angle = reader.read_float()
-            return Instruction(op, VelAngleInstruction(angle))
-
-        elif op == OpCode.MUL_VEL:
-            factor = reader.read_float()
-            return Instruction(op, VelMulInstruction(factor))
-
-        elif op == OpCode.MUL_VEL_AXIS:
-            x = reader.read_float()
-            y = reader.read_float()
-            z = reader.read_float()
-            return Instruction(op, VelAxisMulInstruction(x, y, z))
-
-        elif op == OpCode.SET_UNK_0B:
-            base = reader.read_u8()
-            range_val = reader.read_u8()
-            return Instruction(op, UnkInstruction(base, range_val))
-
-        elif op == OpCode.SET_FLAGS:
-            flags = reader.read_u8()
-            return Instruction(op, SetFlagsInstruction(flags))
-
-        elif op == OpCode.SET_LOOP:
-            count = reader.read_u8()
-            return Instruction(op, SetLoopInstruction(count))
-
-        elif op == OpCode.SET_SIZE_RAND:
-            steps = reader.read_var_length_u16()
-            base = reader.read_float()
-            range_val = reader.read_float()
-            return Instruction(op, SetSizeRandInstruction(steps, base, range_val))
-
-        # Simple instructions with no parameters
-        elif op in [
-            OpCode.LOOP,
-            OpCode.SET_RETURN,
-            OpCode.RETURN,
-            OpCode.DEAD,
-            OpCode.END,
-        ]:
-            return Instruction(op, SimpleInstruction())
-
-        return None
-
-    def _parse_effect_script(self, next_ptr: Optional[int] = None) -> EffectScript:
-        kind = self.reader.read_u16()
-        texture_id = self.reader.read_u16()
-        effect_lifetime = self.reader.read_u16()
-        particle_lifetime = self.reader.read_u16()
-        flags = self.reader.read_u32()
-        gravity = self.reader.read_float()
-        friction = self.reader.read_float()
-        velocity = self.reader.read_vec3f()
-
-        # Skip unknown fields
-        self.reader.skip(12)  # 3 unknown float fields
-
-        size = self.reader.read_float()
-
-        # Parse bytecode until next effect or end of file
-        bytecode = []
-        while True:
-            if next_ptr is not None and self.reader.offset >= next_ptr:
-                break
-
-            instr = self._parse_instruction()
-            if instr is None:
-                break
-
-            bytecode.append(instr)
-            if instr.opcode == OpCode.END:
-                break
+        instr = handler(reader.data, offset)
+        reader.offset += _SIZES[opcode] or _SIZERS[opcode](reader.data, offset)
+        return instr
 
-        return EffectScript(
-            kind=kind,
-            texture_id=texture_id,
-            effect_lifetime=effect_lifetime,
-            particle_lifetime=particle_lifetime,
-            flags=flags,
-            gravity=gravity,
-            friction=friction,
-            velocity=velocity,
-            size=size,
-            bytecode=bytecode,
-        )
-
-    def _parse_particle_script_desc(self) -> ParticleScriptDesc:
+    def _parse_particle_script_desc(
+        self, data: Buffer, executor: Optional[Executor] = None
+    ) -> ParticleScriptDesc:
         count = self.reader.read_s32()
-        scripts = []
 
-        # First read all pointers
-        for _ in range(count):
-            ptr_value = self.reader.read_u32()
-            scripts.append(EffectScriptPtr(ptr_value=ptr_value, target=None))
+        # First read all pointers in one go
+        table = struct.Struct(f">{max(count, 0)}I")
+        pointers = table.unpack_from(self.reader.data, self.reader.offset)
+        self.reader.offset += table.size
+        scripts = [EffectScriptPtr(ptr_value=ptr, target=None) for ptr in pointers]
+
+        # Each script ends where the next non-null pointer starts
+        next_ptrs: List[Optional[int]] = [None] * len(scripts)
+        next_ptr = None
+        for i in range(len(scripts) - 1, -1, -1):
+            next_ptrs[i] = next_ptr
+            if scripts[i].ptr_value != 0:
+                next_ptr = scripts[i].ptr_value
 
         # Now parse each script at its pointer location
-        for i, script in enumerate(scripts):
-            if script.ptr_value != 0:
-                # Get the next pointer location if there is one
-                next_ptr = None
-                for next_script in scripts[i + 1 :]:
-                    if next_script.ptr_value != 0:
-                        next_ptr = next_script.ptr_value
-                        break
-
-                old_offset = self.reader.offset
-                self.reader.seek(script.ptr_value)
-                script.target = self._parse_effect_script(next_ptr)
-                self.reader.seek(old_offset)
+        jobs = [
+            (script, next_ptr)
+            for script, next_ptr in zip(scripts, next_ptrs)
+            if script.ptr_value != 0
+        ]
+        ptrs = [script.ptr_value for script, _ in jobs]
+        ends = [next_ptr for _, next_ptr in jobs]
+        if executor is not None and len(jobs) > _PARALLEL_THRESHOLD:
+            # Threads can share the input; anything else, such as a process
+            # pool, is sent only each job's own script instead of all of it
+            share = isinstance(executor, ThreadPoolExecutor)
+            futures = []
+            try:
+                for ptr, end in zip(ptrs, ends):
+                    if share:
+                        args = (data, ptr, end)
+                    else:
+                        chunk, chunk_end = _script_bytes(self.reader.data, ptr, end)
+                        args = (chunk, 0, chunk_end)
+                    futures.append(executor.submit(_parse_effect_script, *args))
+                targets = [future.result() for future in futures]
+            finally:
+                # If a script failed, don't leave the others running past parse()
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+        else:
+            targets = map(_parse_effect_script, repeat(data), ptrs, ends)
+        for (script, _), target in zip(jobs, targets):
+            script.target = target
 
         return ParticleScriptDesc(count=count, scripts=scripts)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from enum import IntEnum
 from typing import List, Optional, Union
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Vec3f:
     x: float
     y: float
@@ -13,6 +14,9 @@ class Vec3f:
 
 
 class OpCode(IntEnum):
+    # Wait command, the opcode byte (0x00-0x7F) also encodes its arguments
+    WAIT = 0x00  # Wait a number of frames
+
     # Vector operations
     SET_POS = 0x80  # Set particle position
     ADD_POS = 0x88  # Add to particle position
@@ -71,26 +75,26 @@ class OpCode(IntEnum):
 
 
 # AST Node Classes
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WaitInstruction:
     frames: int
     data_id: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VectorInstruction:
     x: Optional[float] = None
     y: Optional[float] = None
     z: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SizeLerpInstruction:
     steps: int
     target_size: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ColorBlendInstruction:
     steps: int
     red: Optional[int] = None
@@ -99,77 +103,77 @@ class ColorBlendInstruction:
     alpha: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScriptInstruction:
     script_id: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LifeRandInstruction:
     base_life: int
     random_range: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TryDeadRandInstruction:
     probability: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VelRandInstruction:
     x_range: float
     y_range: float
     z_range: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VelAngleInstruction:
     angle: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VelMulInstruction:
     factor: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VelAxisMulInstruction:
     x_factor: float
     y_factor: float
     z_factor: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UnkInstruction:
     base_value: int
     random_range: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SetFlagsInstruction:
     flags: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SetLoopInstruction:
     count: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SimpleInstruction:
     """For instructions that take no parameters"""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SetSizeRandInstruction:
     steps: int
     base: float
     random_range: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Instruction:
     opcode: OpCode
     args: Union[
@@ -192,7 +196,7 @@ class Instruction:
     ]
 
 
-@dataclass
+@dataclass(slots=True)
 class EffectScript:
     kind: int
     texture_id: int
@@ -203,16 +207,16 @@ class EffectScript:
     friction: float
     velocity: Vec3f
     size: float
-    bytecode: List[Instruction]
+    bytecode: Sequence[Instruction]
 
 
-@dataclass
+@dataclass(slots=True)
 class EffectScriptPtr:
     ptr_value: int
     target: Optional[EffectScript]
 
 
-@dataclass
+@dataclass(slots=True)
 class ParticleScriptDesc:
     count: int
     scripts: List[EffectScriptPtr]
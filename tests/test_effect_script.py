@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict
+from dataclasses import FrozenInstanceError, dataclass, field
 
 import pytest
 
 from hal_effect.parser import EffectScriptParser
 from hal_effect.types import (
     ColorBlendInstruction,
+    Instruction,
     LifeRandInstruction,
     OpCode,
     ScriptInstruction,
@@ -29,8 +29,12 @@ class InstructionTestCase:
 
     name: str
     bytes_str: str
-    opcode: OpCode
-    args: Dict[str, Any]
+    expected: Instruction
+    raw: bytes = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Decode the hex string once, when the table is built."""
+        self.raw = bytes.fromhex(self.bytes_str.replace(" ", ""))
 
     def __str__(self) -> str:
         """Return the test case name for pytest output."""
@@ -41,172 +45,136 @@ TEST_CASES = [
     InstructionTestCase(
         name="SET_PRIM_BLEND with all components",
         bytes_str="CF 3C FF FF FF 00",
-        opcode=OpCode.SET_PRIM_BLEND,
-        args={
-            "type": ColorBlendInstruction,
-            "steps": 61,
-            "red": 255,
-            "green": 255,
-            "blue": 255,
-            "alpha": 0,
-        },
+        expected=Instruction(
+            OpCode.SET_PRIM_BLEND,
+            ColorBlendInstruction(steps=61, red=255, green=255, blue=255, alpha=0),
+        ),
     ),
     InstructionTestCase(
         name="SET_ENV_BLEND with all components",
         bytes_str="DF 01 80 FF FF FF",
-        opcode=OpCode.SET_ENV_BLEND,
-        args={
-            "type": ColorBlendInstruction,
-            "steps": 2,
-            "red": 128,
-            "green": 255,
-            "blue": 255,
-            "alpha": 255,
-        },
+        expected=Instruction(
+            OpCode.SET_ENV_BLEND,
+            ColorBlendInstruction(steps=2, red=128, green=255, blue=255, alpha=255),
+        ),
     ),
     InstructionTestCase(
         name="SET_SIZE_LERP",
         bytes_str="A0 14 43 7A 00 00",
-        opcode=OpCode.SET_SIZE_LERP,
-        args={"type": SizeLerpInstruction, "steps": 21, "target_size": 250.0},
+        expected=Instruction(
+            OpCode.SET_SIZE_LERP, SizeLerpInstruction(steps=21, target_size=250.0)
+        ),
     ),
     InstructionTestCase(
         name="SET_FLAGS",
         bytes_str="A1 80",
-        opcode=OpCode.SET_FLAGS,
-        args={"type": SetFlagsInstruction, "flags": 0x80},
+        expected=Instruction(OpCode.SET_FLAGS, SetFlagsInstruction(flags=0x80)),
     ),
     InstructionTestCase(
         name="MUL_VEL",
         bytes_str="AB 40 00 00 00",
-        opcode=OpCode.MUL_VEL,
-        args={"type": VelMulInstruction, "factor": 2.0},
+        expected=Instruction(OpCode.MUL_VEL, VelMulInstruction(factor=2.0)),
     ),
     InstructionTestCase(
         name="SET_VEL_ANGLE",
         bytes_str="A9 3E B2 B8 C2",
-        opcode=OpCode.SET_VEL_ANGLE,
-        args={"type": VelAngleInstruction, "angle": 0.34906584},
+        expected=Instruction(
+            OpCode.SET_VEL_ANGLE, VelAngleInstruction(angle=pytest.approx(0.34906584))
+        ),
     ),
     InstructionTestCase(
         name="SET_SIZE_RAND",
         bytes_str="AC 00 40 A0 00 00 41 F0 00 00",
-        opcode=OpCode.SET_SIZE_RAND,
-        args={
-            "type": SetSizeRandInstruction,
-            "steps": 1,
-            "base": 5.0,
-            "random_range": 30.0,
-        },
+        expected=Instruction(
+            OpCode.SET_SIZE_RAND,
+            SetSizeRandInstruction(steps=1, base=5.0, random_range=30.0),
+        ),
     ),
     InstructionTestCase(
         name="SET_PRIM_BLEND with alpha only",
         bytes_str="C8 64 00",
-        opcode=OpCode.SET_PRIM_BLEND,
-        args={
-            "type": ColorBlendInstruction,
-            "steps": 101,
-            "red": None,
-            "green": None,
-            "blue": None,
-            "alpha": 0,
-        },
+        expected=Instruction(
+            OpCode.SET_PRIM_BLEND, ColorBlendInstruction(steps=101, alpha=0)
+        ),
     ),
     InstructionTestCase(
         name="SET_POS with all components",
         bytes_str="87 42 4C 00 00 44 C2 00 00 C2 80 00 00",
-        opcode=OpCode.SET_POS,
-        args={"type": VectorInstruction, "x": 51.0, "y": 1552.0, "z": -64.0},
+        expected=Instruction(
+            OpCode.SET_POS, VectorInstruction(x=51.0, y=1552.0, z=-64.0)
+        ),
+    ),
+    InstructionTestCase(
+        name="ADD_VEL with x and z",
+        bytes_str="9D 3F 80 00 00 C0 00 00 00",
+        expected=Instruction(OpCode.ADD_VEL, VectorInstruction(x=1.0, z=-2.0)),
     ),
     InstructionTestCase(
         name="SET_UNK_0B",
         bytes_str="BC 00 03",
-        opcode=OpCode.SET_UNK_0B,
-        args={"type": UnkInstruction, "base_value": 0, "random_range": 3},
+        expected=Instruction(
+            OpCode.SET_UNK_0B, UnkInstruction(base_value=0, random_range=3)
+        ),
     ),
     InstructionTestCase(
         name="TRY_DEAD_RAND",
         bytes_str="A7 0A",
-        opcode=OpCode.TRY_DEAD_RAND,
-        args={"type": TryDeadRandInstruction, "probability": 10},
+        expected=Instruction(
+            OpCode.TRY_DEAD_RAND, TryDeadRandInstruction(probability=10)
+        ),
     ),
     InstructionTestCase(
         name="SET_LIFE_RAND",
         bytes_str="A6 00 32 00 32",
-        opcode=OpCode.SET_LIFE_RAND,
-        args={"type": LifeRandInstruction, "base_life": 50, "random_range": 50},
+        expected=Instruction(
+            OpCode.SET_LIFE_RAND, LifeRandInstruction(base_life=50, random_range=50)
+        ),
     ),
     InstructionTestCase(
         name="SET_ENV_BLEND with red and blue",
         bytes_str="D7 00 00 FF 15",
-        opcode=OpCode.SET_ENV_BLEND,
-        args={
-            "type": ColorBlendInstruction,
-            "steps": 1,
-            "red": 0,
-            "green": 255,
-            "blue": 21,
-            "alpha": None,
-        },
+        expected=Instruction(
+            OpCode.SET_ENV_BLEND,
+            ColorBlendInstruction(steps=1, red=0, green=255, blue=21),
+        ),
     ),
     InstructionTestCase(
         name="MAKE_GENERATOR",
         bytes_str="A5 00 17",
-        opcode=OpCode.MAKE_GENERATOR,
-        args={"type": ScriptInstruction, "script_id": 23},
+        expected=Instruction(OpCode.MAKE_GENERATOR, ScriptInstruction(script_id=23)),
     ),
     InstructionTestCase(
         name="MAKE_SCRIPT",
         bytes_str="A4 00 48",
-        opcode=OpCode.MAKE_SCRIPT,
-        args={"type": ScriptInstruction, "script_id": 72},
+        expected=Instruction(OpCode.MAKE_SCRIPT, ScriptInstruction(script_id=72)),
     ),
 ]
 
 
-def hex_to_bytes(hex_str: str) -> bytes:
-    """Convert a space-separated hex string to bytes."""
-    return bytes.fromhex(hex_str.replace(" ", ""))
+@pytest.fixture(scope="module")
+def parser() -> EffectScriptParser:
+    """Share one parser between the instruction tests."""
+    return EffectScriptParser()
 
 
 @pytest.mark.parametrize("case", TEST_CASES, ids=str)
-def test_parse_instructions(case: InstructionTestCase):
+def test_parse_instructions(parser: EffectScriptParser, case: InstructionTestCase):
     """Test parsing various instructions with their arguments."""
-    data = hex_to_bytes(case.bytes_str)
-    parser = EffectScriptParser()
-    instr = parser._parse_instruction(data)
-
-    assert instr is not None
-    assert instr.opcode == case.opcode
-
-    # Check the type of the instruction arguments
-    assert isinstance(instr.args, case.args["type"])
-
-    # Check each expected argument value
-    for key, value in case.args.items():
-        if key != "type":
-            if isinstance(value, float):
-                # Floating point values need to be compared with pytest.approx
-                assert getattr(instr.args, key) == pytest.approx(value), (
-                    f"Argument {key} mismatch"
-                )
-            else:
-                assert getattr(instr.args, key) == value, f"Argument {key} mismatch"
+    assert parser._parse_instruction(case.raw) == case.expected
 
 
-def test_parse_wait_instruction():
+def test_parse_wait_instruction(parser: EffectScriptParser):
     """Test parsing various forms of wait instructions."""
     # Simple wait
     data = bytes([0x05])
-    parser = EffectScriptParser()
     instr = parser._parse_instruction(data)
+    assert instr.opcode == OpCode.WAIT
     assert isinstance(instr.args, WaitInstruction)
     assert instr.args.frames == 5
     assert instr.args.data_id is None
 
     # Wait with extra byte
     data = bytes([0x2C, 0x01])
-    parser = EffectScriptParser()
     instr = parser._parse_instruction(data)
     assert isinstance(instr.args, WaitInstruction)
     assert instr.args.frames == 3073
@@ -214,8 +182,27 @@ def test_parse_wait_instruction():
 
     # Wait with data ID
     data = bytes([0x45, 0x7B])
-    parser = EffectScriptParser()
     instr = parser._parse_instruction(data)
     assert isinstance(instr.args, WaitInstruction)
     assert instr.args.frames == 5
     assert instr.args.data_id == 123
+
+
+def test_parse_unknown_instruction(parser: EffectScriptParser):
+    """Test that opcodes without a decoder are rejected without raising."""
+    assert parser._parse_instruction(bytes([0xF9])) is None
+    assert parser._parse_instruction(bytes([0xA2, 0x3F, 0x80, 0x00, 0x00])) is None
+    assert parser._parse_instruction(b"") is None
+
+
+def test_parse_shared_instructions(parser: EffectScriptParser):
+    """Test that small immutable instructions are shared between occurrences."""
+    end = parser._parse_instruction(bytes([0xFF]))
+    assert end is parser._parse_instruction(bytes([0xFF]))
+
+    flags = parser._parse_instruction(bytes([0xA1, 0x80]))
+    assert flags is parser._parse_instruction(bytes([0xA1, 0x80]))
+    assert flags is not parser._parse_instruction(bytes([0xA1, 0x40]))
+
+    with pytest.raises(FrozenInstanceError):
+        flags.args.flags = 0x40
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import pytest
 
 from hal_effect.parser import EffectScriptParser
@@ -11,6 +15,20 @@ def hex_to_bytes(hex_str: str) -> bytes:
     return bytes.fromhex(hex_str.replace(" ", ""))
 
 
+def build_archive(*bytecodes: bytes) -> bytes:
+    """Build a particle script file with an effect script for every bytecode.
+
+    The scripts share one header and follow the pointer table back to back.
+    """
+    header = struct.pack(">HHHHIfffff12xf", 0, 1, 20, 30, 2, 1.0, 0.98, 0, 6, 0, 1.0)
+    data = struct.pack(">i", len(bytecodes))
+    offset = 4 + 4 * len(bytecodes)
+    for bytecode in bytecodes:
+        data += struct.pack(">I", offset)
+        offset += len(header) + len(bytecode)
+    return data + b"".join(header + bytecode for bytecode in bytecodes)
+
+
 def test_parse_particle_script():
     """Test parsing a complete particle script file."""
     # This is a particle script with 2 effect scripts
@@ -103,3 +121,148 @@ def test_parse_particle_script():
     # Check second script bytecode - only END instruction, rest is padding
     assert len(script2.bytecode) == 1
     assert script2.bytecode[0].opcode == OpCode.END
+
+
+def test_parse_bytecode():
+    """Test that bytecode is scanned up to END and decoded on access."""
+    data = (
+        # Header: count=1
+        "00 00 00 01"
+        " 00 00 00 08"  # Script at offset 0x08
+        " 00 00 00 00 00 00 00 00"  # kind, texture_id, lifetimes
+        " 00 00 00 00"  # flags
+        " 00 00 00 00 00 00 00 00"  # gravity, friction
+        " 00 00 00 00 00 00 00 00 00 00 00 00"  # velocity
+        " 00 00 00 00 00 00 00 00 00 00 00 00"  # unk20, unk24, unk28
+        " 3F 80 00 00"  # size=1.0
+        " 05"  # wait 5 frames
+        " A1 80"  # SET_FLAGS 0x80
+        " C8 64 00"  # SET_PRIM_BLEND alpha only
+        " FF"  # END instruction
+        " A1 01"  # Padding
+    )
+
+    parser = EffectScriptParser()
+    result = parser.parse(hex_to_bytes(data))
+    bytecode = result.scripts[0].target.bytecode
+
+    assert len(bytecode) == 4
+    assert bytecode.opcodes == bytes([0x05, 0xA1, 0xC8, 0xFF])
+    assert bytecode[0].opcode == OpCode.WAIT
+    assert bytecode[0].args.frames == 5
+    assert bytecode[1].opcode == OpCode.SET_FLAGS
+    assert bytecode[1].args.flags == 0x80
+    assert bytecode[2].args.alpha == 0
+    assert bytecode[-1].opcode == OpCode.END
+    assert [instr.opcode for instr in bytecode[1:]] == [
+        OpCode.SET_FLAGS,
+        OpCode.SET_PRIM_BLEND,
+        OpCode.END,
+    ]
+
+    tail = bytecode[1:]
+    assert tail.opcodes == bytes([0xA1, 0xC8, 0xFF])
+    assert tail == list(bytecode)[1:]
+    assert bytecode[::2] == [bytecode[0], bytecode[2]]
+
+
+def test_parse_with_executor(tmp_path):
+    """Test that parsing scripts through an executor matches serial parsing."""
+    count = 12
+    data = build_archive(*(bytes([0x05, 0xA1, i, 0xFF]) for i in range(count)))
+
+    parser = EffectScriptParser()
+    expected = parser.parse(data)
+    path = tmp_path / "particles.bin"
+    path.write_bytes(data)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = parser.parse(data, executor)
+        assert parser.parse_file(path, executor) == expected
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert parser.parse(data, executor) == expected
+
+    assert result == expected
+    assert [ptr.target.bytecode[1].args.flags for ptr in result.scripts] == list(
+        range(count)
+    )
+
+
+def test_parse_buffer():
+    """Test that any buffer can be parsed without converting it to bytes."""
+    data = build_archive(hex_to_bytes("A1 80 FF"))  # SET_FLAGS 0x80, END
+
+    parser = EffectScriptParser()
+    expected = parser.parse(data)
+    result = parser.parse(memoryview(bytearray(data)))
+
+    assert result == expected
+    assert isinstance(result.scripts[0].target.bytecode.data, bytes)
+    assert result.scripts[0].target.bytecode[0].args.flags == 0x80
+
+
+def test_parse_wide_buffer():
+    """Test that buffers with multi-byte items are read by byte offset."""
+    # SET_FLAGS 0x80, END, padding to a whole item
+    data = build_archive(hex_to_bytes("A1 80 FF 00"))
+    items = array("I")
+    items.frombytes(data)
+
+    parser = EffectScriptParser()
+    result = parser.parse(items)
+
+    assert result == parser.parse(data)
+    assert len(result.scripts[0].target.bytecode) == 2
+
+
+def test_parse_releases_buffer():
+    """Test that the parser doesn't keep the input buffer exported."""
+    data = bytearray(build_archive(hex_to_bytes("A1 80 FF")))  # SET_FLAGS 0x80, END
+
+    size = len(data)
+    parser = EffectScriptParser()
+    parser.parse(data)
+    data.extend(b"\x00")  # Resizing fails while a view is still exported
+
+    assert len(data) == size + 1
+
+
+def test_parse_file(tmp_path):
+    """Test that parsing a memory-mapped file matches parsing its bytes."""
+    # wait, SET_FLAGS 0x80, END
+    data = build_archive(hex_to_bytes("05 A1 80 FF"))
+    path = tmp_path / "particles.bin"
+    path.write_bytes(data)
+
+    parser = EffectScriptParser()
+    result = parser.parse_file(path)
+
+    assert result == parser.parse(data)
+    assert result.scripts[0].target.bytecode[1].args.flags == 0x80
+
+
+# Cut in the pointer table, in the header, and inside SET_FLAGS
+@pytest.mark.parametrize("size", [0, 4, 28, 58])
+def test_parse_truncated_file(tmp_path, size: int):
+    """Test that a truncated file fails with the same error as its bytes."""
+    # wait, SET_FLAGS 0x80, END
+    data = build_archive(hex_to_bytes("05 A1 80 FF"))[:size]
+    path = tmp_path / "particles.bin"
+    path.write_bytes(data)
+
+    parser = EffectScriptParser()
+    with pytest.raises(struct.error):
+        parser.parse(data)
+    with pytest.raises(struct.error):
+        parser.parse_file(path)
+
+
+def test_parse_file_with_executor_error(tmp_path):
+    """Test that a failing script surfaces its own error through an executor."""
+    data = build_archive(*[bytes([0x05, 0xFF])] * 12)
+    path = tmp_path / "particles.bin"
+    path.write_bytes(data[:-30])  # Cut the last script off inside its header
+
+    parser = EffectScriptParser()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        with pytest.raises(struct.error):
+            parser.parse_file(path, executor)